@@ -341,11 +341,27 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "slow: mark test as slow running"
     )
+    config.addinivalue_line(
+        "markers", "compose: mark test as starting the Docker Compose stack"
+    )
+
+
+def pytest_addoption(parser):
+    """Add command line options for the platform test suite."""
+    parser.addoption(
+        "--run-integration",
+        action="store_true",
+        default=False,
+        help="run tests that start the Docker Compose stack"
+    )
 
 
 # Collection and reporting hooks
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on file location."""
+    run_integration = config.getoption("--run-integration")
+    skip_compose = pytest.mark.skip(reason="starts the Docker Compose stack; needs --run-integration option to run")
+
     for item in items:
         # Add markers based on test file location
         if "auth" in str(item.fspath):
@@ -361,4 +377,8 @@ def pytest_collection_modifyitems(config, items):
         if "integration" in str(item.fspath):
             item.add_marker(pytest.mark.integration)
         else:
-            item.add_marker(pytest.mark.unit) 
\ No newline at end of file
+            item.add_marker(pytest.mark.unit)
+
+        # Compose tests are opt-in because they start real services
+        if not run_integration and item.get_closest_marker("compose"):
+            item.add_marker(skip_compose)
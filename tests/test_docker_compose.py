@@ -3,31 +3,74 @@ Test suite for docker-compose.yml file validation
 Tests that all required services are configured correctly as specified in task 1.3
 """
 import os
+import re
 import yaml
 import pytest
 from pathlib import Path
 
+from tests.yaml_utils import YAML_LOADER
+
+# Leading spaces of every indented line that is not blank or a comment
+INDENT_RE = re.compile(rb'^( +)[ \t]*[^\s#]', re.MULTILINE)
+
+# Accepted names for the PostgreSQL service, in lookup priority order
+POSTGRES_VARIANTS = ("postgres", "postgres-main", "database", "db")
+POSTGRES_VARIANT_SET = frozenset(POSTGRES_VARIANTS)
+
+
+def find_postgres_service_name(services):
+    """Return the PostgreSQL service name defined in services, or None"""
+    matches = POSTGRES_VARIANT_SET & services.keys()
+    return min(matches, key=POSTGRES_VARIANTS.index, default=None)
+
+
+def dependency_roles(service):
+    """Return the roles ("postgres", "redis", "backend") a service depends on, in one pass"""
+    depends_on = service.get("depends_on")
+    if not isinstance(depends_on, (list, dict)):
+        depends_on = ()
+    
+    roles = set()
+    for dep in depends_on:
+        dep = dep.lower()
+        if "postgres" in dep or "db" in dep:
+            roles.add("postgres")
+        if "redis" in dep:
+            roles.add("redis")
+        if "backend" in dep:
+            roles.add("backend")
+    return roles
+
 
 class TestDockerCompose:
     """Test suite for docker-compose.yml validation"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def compose_file_path(self):
         """Fixture to get the path to docker-compose.yml file"""
         project_root = Path(__file__).parent.parent
         return project_root / "docker-compose.yml"
     
-    @pytest.fixture
-    def compose_content(self, compose_file_path):
-        """Fixture to read and parse docker-compose.yml file content"""
+    @pytest.fixture(scope="session")
+    def compose_file_bytes(self, compose_file_path):
+        """Fixture to read docker-compose.yml once as raw bytes"""
         if not compose_file_path.exists():
             pytest.fail(f"docker-compose.yml file not found at {compose_file_path}")
         
-        with open(compose_file_path, 'r') as f:
-            try:
-                return yaml.safe_load(f)
-            except yaml.YAMLError as e:
-                pytest.fail(f"Invalid YAML in docker-compose.yml: {e}")
+        return compose_file_path.read_bytes()
+    
+    @pytest.fixture(scope="session")
+    def compose_content(self, compose_file_bytes):
+        """Fixture to parse docker-compose.yml file content"""
+        try:
+            return yaml.load(compose_file_bytes, Loader=YAML_LOADER)
+        except yaml.YAMLError as e:
+            pytest.fail(f"Invalid YAML in docker-compose.yml: {e}")
+    
+    @pytest.fixture(scope="session")
+    def services(self, compose_content):
+        """Fixture to extract the services section of docker-compose.yml"""
+        return compose_content.get("services", {})
     
     def test_compose_file_exists(self, compose_file_path):
         """Test that docker-compose.yml file exists in project root"""
@@ -50,28 +93,18 @@ class TestDockerCompose:
         
         for service in required_services:
             # Check for exact name or variations (postgres-main, etc.)
-            postgres_variants = ["postgres", "postgres-main", "database", "db"]
             if service == "postgres":
-                found = any(variant in services for variant in postgres_variants)
-                assert found, f"PostgreSQL service not found. Expected one of: {postgres_variants}"
+                found = find_postgres_service_name(services) is not None
+                assert found, f"PostgreSQL service not found. Expected one of: {list(POSTGRES_VARIANTS)}"
             else:
                 assert service in services, f"Required service '{service}' not found in docker-compose.yml"
     
-    def test_postgresql_service_configuration(self, compose_content):
+    def test_postgresql_service_configuration(self, services):
         """Test PostgreSQL service configuration"""
-        services = compose_content["services"]
-        
         # Find PostgreSQL service (could be 'postgres', 'postgres-main', etc.)
-        postgres_service = None
-        postgres_variants = ["postgres", "postgres-main", "database", "db"]
-        
-        for variant in postgres_variants:
-            if variant in services:
-                postgres_service = services[variant]
-                postgres_name = variant
-                break
-        
-        assert postgres_service is not None, f"PostgreSQL service not found among {postgres_variants}"
+        postgres_name = find_postgres_service_name(services)
+        assert postgres_name is not None, f"PostgreSQL service not found among {list(POSTGRES_VARIANTS)}"
+        postgres_service = services[postgres_name]
         
         # Check image
         assert "image" in postgres_service, f"PostgreSQL service '{postgres_name}' must specify an image"
@@ -99,9 +132,8 @@ class TestDockerCompose:
             port_found = any("5432" in str(port) for port in ports)
             assert port_found, "PostgreSQL service should expose port 5432"
     
-    def test_redis_service_configuration(self, compose_content):
+    def test_redis_service_configuration(self, services):
         """Test Redis service configuration"""
-        services = compose_content["services"]
         assert "redis" in services, "Redis service not found"
         
         redis_service = services["redis"]
@@ -118,9 +150,8 @@ class TestDockerCompose:
             port_found = any("6379" in str(port) for port in ports)
             assert port_found, "Redis service should expose port 6379"
     
-    def test_backend_service_configuration(self, compose_content):
+    def test_backend_service_configuration(self, services):
         """Test backend service configuration"""
-        services = compose_content["services"]
         assert "backend" in services, "Backend service not found"
         
         backend_service = services["backend"]
@@ -146,24 +177,14 @@ class TestDockerCompose:
         
         # Check dependencies
         if "depends_on" in backend_service:
-            depends_on = backend_service["depends_on"]
             # Should depend on database and redis
-            if isinstance(depends_on, list):
-                deps_lower = [dep.lower() for dep in depends_on]
-            elif isinstance(depends_on, dict):
-                deps_lower = [dep.lower() for dep in depends_on.keys()]
-            else:
-                deps_lower = []
+            roles = dependency_roles(backend_service)
             
-            postgres_dep = any("postgres" in dep or "db" in dep for dep in deps_lower)
-            redis_dep = any("redis" in dep for dep in deps_lower)
-            
-            assert postgres_dep, "Backend should depend on PostgreSQL service"
-            assert redis_dep, "Backend should depend on Redis service"
+            assert "postgres" in roles, "Backend should depend on PostgreSQL service"
+            assert "redis" in roles, "Backend should depend on Redis service"
     
-    def test_frontend_service_configuration(self, compose_content):
+    def test_frontend_service_configuration(self, services):
         """Test frontend service configuration"""
-        services = compose_content["services"]
         assert "frontend" in services, "Frontend service not found"
         
         frontend_service = services["frontend"]
@@ -189,21 +210,11 @@ class TestDockerCompose:
         
         # Check dependencies (optional but recommended)
         if "depends_on" in frontend_service:
-            depends_on = frontend_service["depends_on"]
-            if isinstance(depends_on, list):
-                deps_lower = [dep.lower() for dep in depends_on]
-            elif isinstance(depends_on, dict):
-                deps_lower = [dep.lower() for dep in depends_on.keys()]
-            else:
-                deps_lower = []
-            
-            backend_dep = any("backend" in dep for dep in deps_lower)
-            assert backend_dep, "Frontend should depend on Backend service"
+            roles = dependency_roles(frontend_service)
+            assert "backend" in roles, "Frontend should depend on Backend service"
     
-    def test_environment_variable_usage(self, compose_content):
+    def test_environment_variable_usage(self, services):
         """Test that services use environment variables appropriately"""
-        services = compose_content["services"]
-        
         # Check that services use environment variables for configuration
         for service_name, service_config in services.items():
             if "environment" in service_config:
@@ -229,18 +240,11 @@ class TestDockerCompose:
                         if has_sensitive:
                             assert env_var_usage, f"Service {service_name} should use environment variables for sensitive configuration"
     
-    def test_volumes_configuration(self, compose_content):
+    def test_volumes_configuration(self, compose_content, services):
         """Test that persistent volumes are properly configured"""
-        services = compose_content["services"]
-        
         # Check PostgreSQL has persistent volume
-        postgres_variants = ["postgres", "postgres-main", "database", "db"]
-        postgres_service = None
-        
-        for variant in postgres_variants:
-            if variant in services:
-                postgres_service = services[variant]
-                break
+        postgres_name = find_postgres_service_name(services)
+        postgres_service = services[postgres_name] if postgres_name else None
         
         if postgres_service and "volumes" in postgres_service:
             volumes = postgres_service["volumes"]
@@ -253,7 +257,7 @@ class TestDockerCompose:
             volumes_section = compose_content["volumes"]
             assert isinstance(volumes_section, dict), "Volumes section should be a dictionary"
     
-    def test_networks_configuration(self, compose_content):
+    def test_networks_configuration(self, compose_content, services):
         """Test network configuration (optional but good practice)"""
         # Networks are optional but if present should be properly configured
         if "networks" in compose_content:
@@ -262,7 +266,6 @@ class TestDockerCompose:
             
             # If custom networks are defined, services should use them
             if networks:
-                services = compose_content["services"]
                 for service_name, service_config in services.items():
                     if "networks" in service_config:
                         service_networks = service_config["networks"]
@@ -271,21 +274,10 @@ class TestDockerCompose:
                             for network in service_networks:
                                 assert network in networks, f"Service {service_name} references undefined network: {network}"
     
-    def test_yaml_structure_validity(self, compose_file_path):
+    def test_yaml_structure_validity(self, compose_file_bytes):
         """Test that the YAML structure is valid and well-formed"""
-        with open(compose_file_path, 'r') as f:
-            content = f.read()
-        
-        # Check for common YAML issues
-        lines = content.split('\n')
-        
-        # Check indentation consistency
-        indent_sizes = set()
-        for line in lines:
-            if line.strip() and not line.strip().startswith('#'):
-                leading_spaces = len(line) - len(line.lstrip(' '))
-                if leading_spaces > 0:
-                    indent_sizes.add(leading_spaces)
+        # Check indentation consistency of indented, non-comment lines
+        indent_sizes = {len(match.group(1)) for match in INDENT_RE.finditer(compose_file_bytes)}
         
         # Should use consistent indentation (typically 2 or 4 spaces)
         if indent_sizes:
@@ -296,10 +288,8 @@ class TestDockerCompose:
             for indent in indent_sizes:
                 assert indent % min_indent == 0, f"Inconsistent indentation found: {indent} (should be multiple of {min_indent})"
     
-    def test_service_health_checks(self, compose_content):
+    def test_service_health_checks(self, services):
         """Test that critical services have health checks (optional but recommended)"""
-        services = compose_content["services"]
-        
         # Critical services that should have health checks
         critical_services = ["backend", "postgres", "postgres-main", "redis"]
         
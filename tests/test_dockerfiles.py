@@ -11,6 +11,38 @@ import re
 import yaml
 from pathlib import Path
 
+# Patterns are compiled once at import rather than on every test call
+PYTHON_311_RE = re.compile(r'FROM\s+python:3\.11', re.IGNORECASE)
+NODE_18_RE = re.compile(r'FROM\s+node:18', re.IGNORECASE)
+BACKEND_PORT_RE = re.compile(r'EXPOSE\s+8000')
+FRONTEND_PORT_RE = re.compile(r'EXPOSE\s+(80|3000)')
+INSTRUCTION_RE = re.compile(r'^\s*(WORKDIR|COPY|RUN|EXPOSE|CMD|ENTRYPOINT)\b', re.MULTILINE)
+
+
+@pytest.fixture(scope="session")
+def backend_dockerfile_content():
+    """Read the backend Dockerfile once for the whole test session."""
+    try:
+        return Path("docker/backend.Dockerfile").read_text()
+    except FileNotFoundError:
+        pytest.skip("docker/backend.Dockerfile missing")
+
+
+@pytest.fixture(scope="session")
+def frontend_dockerfile_content():
+    """Read the frontend Dockerfile once for the whole test session."""
+    try:
+        return Path("docker/frontend.Dockerfile").read_text()
+    except FileNotFoundError:
+        pytest.skip("docker/frontend.Dockerfile missing")
+
+
+@pytest.fixture
+def dockerfile_content(request):
+    """Resolve a Dockerfile kind ("backend" or "frontend") to its session-cached content."""
+    return request.getfixturevalue(f"{request.param}_dockerfile_content")
+
+
 class TestDockerfiles:
     """Test suite for Docker file requirements."""
     
@@ -24,91 +56,66 @@ class TestDockerfiles:
         frontend_dockerfile = Path("docker/frontend.Dockerfile")
         assert frontend_dockerfile.exists(), "Frontend Dockerfile should exist in docker/ directory"
     
-    def test_backend_dockerfile_uses_python_311(self):
+    def test_backend_dockerfile_uses_python_311(self, backend_dockerfile_content):
         """Test that backend Dockerfile uses Python 3.11 as required by task 1.4."""
-        backend_dockerfile = Path("docker/backend.Dockerfile")
-        content = backend_dockerfile.read_text()
+        content = backend_dockerfile_content
         
         # Check for Python 3.11 base image
-        python_311_pattern = r'FROM\s+python:3\.11'
-        matches = re.findall(python_311_pattern, content, re.IGNORECASE)
+        matches = PYTHON_311_RE.findall(content)
         
         assert len(matches) >= 1, f"Backend Dockerfile must use Python 3.11, found matches: {matches}"
     
-    def test_frontend_dockerfile_uses_node_18(self):
+    def test_frontend_dockerfile_uses_node_18(self, frontend_dockerfile_content):
         """Test that frontend Dockerfile uses Node 18 as required by task 1.4."""
-        frontend_dockerfile = Path("docker/frontend.Dockerfile")
-        content = frontend_dockerfile.read_text()
+        content = frontend_dockerfile_content
         
         # Check for Node 18 base image
-        node_18_pattern = r'FROM\s+node:18'
-        matches = re.findall(node_18_pattern, content, re.IGNORECASE)
+        matches = NODE_18_RE.findall(content)
         
         assert len(matches) >= 1, f"Frontend Dockerfile must use Node 18, found matches: {matches}"
     
-    def test_backend_dockerfile_structure(self):
-        """Test that backend Dockerfile has proper structure."""
-        backend_dockerfile = Path("docker/backend.Dockerfile")
-        content = backend_dockerfile.read_text()
+    @pytest.mark.parametrize("dockerfile_content", ["backend", "frontend"], indirect=True)
+    def test_dockerfile_structure(self, dockerfile_content):
+        """Test that each Dockerfile has proper structure."""
+        # Collect the essential Dockerfile instructions in a single pass
+        found = {match.group(1) for match in INSTRUCTION_RE.finditer(dockerfile_content)}
         
-        # Check for essential Dockerfile commands
-        assert 'WORKDIR' in content, "Backend Dockerfile should set WORKDIR"
-        assert 'COPY' in content, "Backend Dockerfile should have COPY instructions"
-        assert 'RUN' in content, "Backend Dockerfile should have RUN instructions"
-        assert 'EXPOSE' in content, "Backend Dockerfile should expose a port"
-        assert 'CMD' in content or 'ENTRYPOINT' in content, "Backend Dockerfile should have CMD or ENTRYPOINT"
+        assert 'WORKDIR' in found, "Dockerfile should set WORKDIR"
+        assert 'COPY' in found, "Dockerfile should have COPY instructions"
+        assert 'RUN' in found, "Dockerfile should have RUN instructions"
+        assert 'EXPOSE' in found, "Dockerfile should expose a port"
+        assert found & {'CMD', 'ENTRYPOINT'}, "Dockerfile should have CMD or ENTRYPOINT"
     
-    def test_frontend_dockerfile_structure(self):
-        """Test that frontend Dockerfile has proper structure."""
-        frontend_dockerfile = Path("docker/frontend.Dockerfile")
-        content = frontend_dockerfile.read_text()
-        
-        # Check for essential Dockerfile commands
-        assert 'WORKDIR' in content, "Frontend Dockerfile should set WORKDIR"
-        assert 'COPY' in content, "Frontend Dockerfile should have COPY instructions"
-        assert 'RUN' in content, "Frontend Dockerfile should have RUN instructions"
-        assert 'EXPOSE' in content, "Frontend Dockerfile should expose a port"
-        assert 'CMD' in content or 'ENTRYPOINT' in content, "Frontend Dockerfile should have CMD or ENTRYPOINT"
+    @pytest.mark.parametrize(
+        "dockerfile_content,port_pattern,expected_ports",
+        [
+            ("backend", BACKEND_PORT_RE, "8000"),
+            # 80 is common for nginx
+            ("frontend", FRONTEND_PORT_RE, "80 or 3000"),
+        ],
+        indirect=["dockerfile_content"],
+        ids=["backend", "frontend"],
+    )
+    def test_dockerfile_exposes_port(self, dockerfile_content, port_pattern, expected_ports):
+        """Test that each Dockerfile exposes its expected port."""
+        assert port_pattern.search(dockerfile_content), f"Dockerfile should expose port {expected_ports}"
     
-    def test_backend_dockerfile_exposes_port_8000(self):
-        """Test that backend Dockerfile exposes port 8000."""
-        backend_dockerfile = Path("docker/backend.Dockerfile")
-        content = backend_dockerfile.read_text()
-        
-        # Check for port 8000 exposure
-        port_pattern = r'EXPOSE\s+8000'
-        assert re.search(port_pattern, content), "Backend Dockerfile should expose port 8000"
-    
-    def test_frontend_dockerfile_exposes_port_80(self):
-        """Test that frontend Dockerfile exposes appropriate port (80 for nginx)."""
-        frontend_dockerfile = Path("docker/frontend.Dockerfile")
-        content = frontend_dockerfile.read_text()
-        
-        # Check for port exposure (80 is common for nginx)
-        port_pattern = r'EXPOSE\s+(80|3000)'
-        assert re.search(port_pattern, content), "Frontend Dockerfile should expose port 80 or 3000"
-    
-    def test_backend_dockerfile_has_health_check(self):
+    def test_backend_dockerfile_has_health_check(self, backend_dockerfile_content):
         """Test that backend Dockerfile includes health check."""
-        backend_dockerfile = Path("docker/backend.Dockerfile")
-        content = backend_dockerfile.read_text()
+        content = backend_dockerfile_content
         
         assert 'HEALTHCHECK' in content, "Backend Dockerfile should include health check"
     
-    def test_frontend_dockerfile_has_health_check(self):
+    def test_frontend_dockerfile_has_health_check(self, frontend_dockerfile_content):
         """Test that frontend Dockerfile includes health check."""
-        frontend_dockerfile = Path("docker/frontend.Dockerfile")
-        content = frontend_dockerfile.read_text()
+        content = frontend_dockerfile_content
         
         assert 'HEALTHCHECK' in content, "Frontend Dockerfile should include health check"
     
-    def test_dockerfiles_are_simple_but_complete(self):
+    def test_dockerfiles_are_simple_but_complete(self, backend_dockerfile_content, frontend_dockerfile_content):
         """Test that Dockerfiles are simple but contain necessary components."""
-        backend_dockerfile = Path("docker/backend.Dockerfile")
-        frontend_dockerfile = Path("docker/frontend.Dockerfile")
-        
-        backend_content = backend_dockerfile.read_text()
-        frontend_content = frontend_dockerfile.read_text()
+        backend_content = backend_dockerfile_content
+        frontend_content = frontend_dockerfile_content
         
         # Backend should have key components
         backend_lines = len(backend_content.splitlines())
@@ -118,13 +125,10 @@ class TestDockerfiles:
         frontend_lines = len(frontend_content.splitlines())
         assert 30 <= frontend_lines <= 100, f"Frontend Dockerfile should be simple but complete (30-100 lines), found {frontend_lines} lines"
     
-    def test_dockerfiles_security_practices(self):
+    def test_dockerfiles_security_practices(self, backend_dockerfile_content, frontend_dockerfile_content):
         """Test that Dockerfiles follow basic security practices."""
-        backend_dockerfile = Path("docker/backend.Dockerfile")
-        frontend_dockerfile = Path("docker/frontend.Dockerfile")
-        
-        backend_content = backend_dockerfile.read_text()
-        frontend_content = frontend_dockerfile.read_text()
+        backend_content = backend_dockerfile_content
+        frontend_content = frontend_dockerfile_content
         
         # Check for non-root user usage
         assert 'USER' in backend_content, "Backend Dockerfile should use non-root user"
@@ -3,158 +3,131 @@ Test suite for .env.example file validation
 Tests that all required environment variables are present in the .env.example file
 """
 import os
+import re
 import pytest
 from pathlib import Path
 
+# Variable names assigned at the start of a line, e.g. "DATABASE_URL=..."
+ASSIGNMENT_RE = re.compile(rb'^\s*([A-Za-z_][A-Za-z0-9_]*)=', re.MULTILINE)
+
+# (category, variable) pairs that .env.example must define
+ENV_VARS = (
+    ("database", "DATABASE_URL"),
+    ("database", "CREDS_DATABASE_URL"),
+    ("database", "POSTGRES_PASSWORD"),
+    ("database", "POSTGRES_CREDS_PASSWORD"),
+    ("redis", "REDIS_URL"),
+    # Task 1.2 specifies JWT_SECRET, but codebase uses JWT_SECRET_KEY
+    ("jwt", "JWT_SECRET_KEY"),
+    ("jwt", "SECRET_KEY"),
+    ("stripe", "STRIPE_SECRET_KEY"),
+    ("stripe", "STRIPE_WEBHOOK_SECRET"),
+    ("stripe", "REACT_APP_STRIPE_PUBLISHABLE_KEY"),
+    ("external service", "SENDGRID_API_KEY"),
+    ("external service", "TWILIO_ACCOUNT_SID"),
+    ("external service", "TWILIO_AUTH_TOKEN"),
+    ("external service", "TWILIO_PHONE_NUMBER"),
+    ("application config", "ENVIRONMENT"),
+    ("application config", "REACT_APP_API_URL"),
+    ("application config", "REACT_APP_ENVIRONMENT"),
+    ("docker port", "BACKEND_PORT"),
+    ("docker port", "FRONTEND_PORT"),
+    ("docker port", "POSTGRES_PORT"),
+    ("docker port", "POSTGRES_CREDS_PORT"),
+    ("docker port", "REDIS_PORT"),
+)
+
+# Phrases the security notes must mention
+SECURITY_KEYWORDS = (
+    b"Never commit actual secrets",
+    b"openssl rand -hex 32",
+    b"production",
+    b"secrets management",
+)
+
+# Common patterns that might indicate real secrets
+FORBIDDEN_PATTERNS = (
+    b"sk_live_",  # Live Stripe keys
+    b"pk_live_",  # Live Stripe publishable keys
+    b"SG.",       # Real SendGrid keys start with SG.
+    b"=AC",       # Real Twilio Account SIDs start with AC (check for value assignment)
+)
+FORBIDDEN_RE = re.compile(b"|".join(map(re.escape, FORBIDDEN_PATTERNS)))
+
+# Placeholder markers expected in place of real values
+PLACEHOLDER_PATTERNS = (
+    b"your_password",
+    b"your_secure_",
+    b"sk_test_",
+    b"pk_test_",
+    b"your_sendgrid_",
+    b"your_twilio_",
+)
+PLACEHOLDER_RE = re.compile(b"|".join(map(re.escape, PLACEHOLDER_PATTERNS)))
+
 
 class TestEnvExample:
     """Test suite for .env.example file validation"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def env_example_path(self):
         """Fixture to get the path to .env.example file"""
         project_root = Path(__file__).parent.parent
         return project_root / ".env.example"
     
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def env_example_content(self, env_example_path):
-        """Fixture to read .env.example file content"""
+        """Fixture to read .env.example file content as raw bytes"""
         if not env_example_path.exists():
             pytest.fail(f".env.example file not found at {env_example_path}")
         
-        with open(env_example_path, 'r') as f:
-            return f.read()
+        # Every check is an ASCII token search, so skip decoding the file
+        return env_example_path.read_bytes()
+    
+    @pytest.fixture(scope="session")
+    def env_example_vars(self, env_example_content):
+        """Fixture to collect every variable assigned in .env.example in one scan"""
+        return {match.group(1).decode() for match in ASSIGNMENT_RE.finditer(env_example_content)}
     
     def test_env_example_file_exists(self, env_example_path):
         """Test that .env.example file exists in project root"""
         assert env_example_path.exists(), f".env.example file should exist at {env_example_path}"
         assert env_example_path.is_file(), f".env.example should be a file, not a directory"
     
-    def test_required_database_variables(self, env_example_content):
-        """Test that required database variables are present"""
-        required_db_vars = [
-            "DATABASE_URL",
-            "CREDS_DATABASE_URL", 
-            "POSTGRES_PASSWORD",
-            "POSTGRES_CREDS_PASSWORD"
-        ]
-        
-        for var in required_db_vars:
-            assert f"{var}=" in env_example_content, f"Required database variable {var} not found in .env.example"
-    
-    def test_required_redis_variables(self, env_example_content):
-        """Test that required Redis variables are present"""
-        assert "REDIS_URL=" in env_example_content, "Required REDIS_URL variable not found in .env.example"
-    
-    def test_required_jwt_variables(self, env_example_content):
-        """Test that required JWT variables are present"""
-        # Task 1.2 specifies JWT_SECRET, but codebase uses JWT_SECRET_KEY
-        assert "JWT_SECRET_KEY=" in env_example_content, "Required JWT_SECRET_KEY variable not found in .env.example"
-        assert "SECRET_KEY=" in env_example_content, "Required SECRET_KEY variable not found in .env.example"
-    
-    def test_required_stripe_variables(self, env_example_content):
-        """Test that required Stripe variables are present"""
-        required_stripe_vars = [
-            "STRIPE_SECRET_KEY",
-            "STRIPE_WEBHOOK_SECRET",
-            "REACT_APP_STRIPE_PUBLISHABLE_KEY"
-        ]
-        
-        for var in required_stripe_vars:
-            assert f"{var}=" in env_example_content, f"Required Stripe variable {var} not found in .env.example"
-    
-    def test_external_service_variables(self, env_example_content):
-        """Test that external service variables are present"""
-        external_vars = [
-            "SENDGRID_API_KEY",
-            "TWILIO_ACCOUNT_SID", 
-            "TWILIO_AUTH_TOKEN",
-            "TWILIO_PHONE_NUMBER"
-        ]
-        
-        for var in external_vars:
-            assert f"{var}=" in env_example_content, f"External service variable {var} not found in .env.example"
-    
-    def test_application_config_variables(self, env_example_content):
-        """Test that application configuration variables are present"""
-        app_vars = [
-            "ENVIRONMENT",
-            "REACT_APP_API_URL",
-            "REACT_APP_ENVIRONMENT"
-        ]
-        
-        for var in app_vars:
-            assert f"{var}=" in env_example_content, f"Application config variable {var} not found in .env.example"
-    
-    def test_docker_port_variables(self, env_example_content):
-        """Test that Docker port configuration variables are present"""
-        port_vars = [
-            "BACKEND_PORT",
-            "FRONTEND_PORT", 
-            "POSTGRES_PORT",
-            "POSTGRES_CREDS_PORT",
-            "REDIS_PORT"
-        ]
-        
-        for var in port_vars:
-            assert f"{var}=" in env_example_content, f"Docker port variable {var} not found in .env.example"
+    @pytest.mark.parametrize("category,var", ENV_VARS)
+    def test_required_variables(self, env_example_vars, category, var):
+        """Test that each required variable is present"""
+        assert var in env_example_vars, f"Required {category} variable {var} not found in .env.example"
     
     def test_security_documentation_present(self, env_example_content):
         """Test that security notes and documentation are present"""
-        security_keywords = [
-            "Never commit actual secrets",
-            "openssl rand -hex 32",
-            "production",
-            "secrets management"
-        ]
-        
-        for keyword in security_keywords:
-            assert keyword in env_example_content, f"Security documentation should mention '{keyword}'"
+        for keyword in SECURITY_KEYWORDS:
+            assert keyword in env_example_content, f"Security documentation should mention '{keyword.decode()}'"
     
     def test_file_structure_and_comments(self, env_example_content):
         """Test that file has proper structure and comments"""
         # Check for section headers
-        assert "DATABASE CONFIGURATION" in env_example_content
-        assert "REDIS CONFIGURATION" in env_example_content
-        assert "AUTHENTICATION & SECURITY" in env_example_content
-        assert "STRIPE PAYMENT PROCESSING" in env_example_content
-        assert "EXTERNAL SERVICES" in env_example_content
-        assert "APPLICATION CONFIGURATION" in env_example_content
-        assert "DOCKER & DEVELOPMENT" in env_example_content
-        assert "SECURITY NOTES" in env_example_content
+        assert b"DATABASE CONFIGURATION" in env_example_content
+        assert b"REDIS CONFIGURATION" in env_example_content
+        assert b"AUTHENTICATION & SECURITY" in env_example_content
+        assert b"STRIPE PAYMENT PROCESSING" in env_example_content
+        assert b"EXTERNAL SERVICES" in env_example_content
+        assert b"APPLICATION CONFIGURATION" in env_example_content
+        assert b"DOCKER & DEVELOPMENT" in env_example_content
+        assert b"SECURITY NOTES" in env_example_content
         
         # Check for proper commenting
-        lines = env_example_content.split('\n')
-        comment_lines = [line for line in lines if line.strip().startswith('#')]
+        lines = env_example_content.split(b'\n')
+        comment_lines = [line for line in lines if line.strip().startswith(b'#')]
         assert len(comment_lines) > 20, "File should have comprehensive comments and documentation"
     
     def test_no_actual_secrets_present(self, env_example_content):
         """Test that no actual secrets are present in the example file"""
-        # Common patterns that might indicate real secrets
-        forbidden_patterns = [
-            "sk_live_",  # Live Stripe keys
-            "pk_live_",  # Live Stripe publishable keys
-            "SG.",       # Real SendGrid keys start with SG.
-            "=AC",       # Real Twilio Account SIDs start with AC (check for value assignment)
-        ]
-        
-        for pattern in forbidden_patterns:
-            assert pattern not in env_example_content, f"Potential real secret pattern '{pattern}' found in .env.example"
+        match = FORBIDDEN_RE.search(env_example_content)
+        assert match is None, f"Potential real secret pattern '{match.group().decode()}' found in .env.example"
     
     def test_placeholder_values_present(self, env_example_content):
         """Test that placeholder values are used instead of real values"""
-        placeholder_patterns = [
-            "your_password",
-            "your_secure_",
-            "sk_test_",
-            "pk_test_",
-            "your_sendgrid_",
-            "your_twilio_"
-        ]
-        
-        found_placeholders = 0
-        for pattern in placeholder_patterns:
-            if pattern in env_example_content:
-                found_placeholders += 1
+        found_placeholders = {match.group() for match in PLACEHOLDER_RE.finditer(env_example_content)}
         
-        assert found_placeholders >= 3, "File should contain placeholder values, not real secrets" 
\ No newline at end of file
+        assert len(found_placeholders) >= 3, "File should contain placeholder values, not real secrets" 
\ No newline at end of file
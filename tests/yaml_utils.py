@@ -0,0 +1,7 @@
+"""
+Shared YAML helpers for the test suite
+"""
+import yaml
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)